@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import codecs
-import glob
+import functools
 import json
 import os
+import re
 import shutil
 import stat
 import sys
 import spinmob
 import spinmob.egg as egg
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from numpy import interp, linspace, isnan, unravel_index
-from scipy.signal import savgol_filter
+from numpy import interp, linspace, isnan, unravel_index, convolve, maximum, ones_like, pad
+
+# Optional: orjson pretty-prints json several times faster than the stdlib.
+try:                import orjson
+except ImportError: orjson = None
 
 # Change to the directory of this script depending on whether this is a "compiled" version or run as script
 if os.path.split(sys.executable)[-1] == 'uploader.exe': os.chdir(os.path.dirname(sys.executable)) # For executable version
@@ -22,6 +26,11 @@ print(os.getcwd())
 exceptions = egg.gui.TimerExceptions()
 exceptions.start()
 
+# Matches either a [SECTION] header or a KEY = VALUE pair (comments excluded),
+# so a whole INI can be scanned with one compiled pattern instead of
+# per-line splits.
+_ini_line = re.compile(r'^[ \t]*(?:\[([^\]\n]+)\]|([^=;\[\n]+?)[ \t]*=[ \t]*([^;\n]*))', re.M)
+
 def generate_linear_gears(start=2.6, stop=1.2, steps=6):
         """
         Just prints out a list of gear values having equal steps in top speed.
@@ -31,16 +40,34 @@ def generate_linear_gears(start=2.6, stop=1.2, steps=6):
         xs = linspace(x1,x2,steps)
         return 1/xs
 
+# Cache of parsed jsons, keyed by path, holding (mtime_ns, size, json), so
+# repeated scans don't re-parse hundreds of unchanged ui_car.json's.
+_json_cache = dict()
+
 # Function for loading a json at the specified path
 def load_json(path):
     """
     Load the supplied path with all the safety measures and encoding etc.
+
+    Unchanged files (same mtime and size) come from a cache rather than
+    being re-read and re-parsed.
     """
-    try: 
+    try:
         if os.path.exists(path):
-            f = codecs.open(path, 'r', 'utf-8-sig', errors='replace')
-            j = json.load(f, strict=False)
-            f.close()
+
+            # If the file hasn't changed since we last parsed it, use the cache.
+            st = os.stat(path)
+            cached = _json_cache.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+
+            # Bulk-read and decode in one shot; the codecs stream reader
+            # decodes incrementally and is several times slower.
+            with open(path, 'rb') as f: data = f.read()
+            j = json.loads(data.decode('utf-8-sig', errors='replace'), strict=False)
+
+            # Remember it for next time.
+            _json_cache[path] = (st.st_mtime_ns, st.st_size, j)
             return j
     except Exception as e:
         print('ERROR: Could not load', path)
@@ -57,6 +84,66 @@ def rmtree(top):
         
     shutil.rmtree(top, onerror=rm_readonly)
 
+@functools.lru_cache(maxsize=None)
+def _cached_stat(path): return os.stat(path)
+
+def fast_copy2(src, dst):
+    """
+    Like shutil.copy2, but reuses a cached stat of the source so copytree
+    doesn't stat each file twice (once for the data, once for the metadata).
+    Clear _cached_stat after the copytree finishes.
+    """
+    shutil.copyfile(src, dst)
+    st = _cached_stat(src)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    return dst
+
+def _copy_with_retry(src, dst):
+    """
+    fast_copy2 with one chmod-and-retry for read-only targets,
+    mirroring rmtree's handler.
+    """
+    try: fast_copy2(src, dst)
+    except PermissionError:
+        os.chmod(dst, stat.S_IWRITE)
+        fast_copy2(src, dst)
+
+def parallel_copytree(src, dst, max_workers=8, threshold=50):
+    """
+    Like shutil.copytree but fans the file copies out over a thread pool,
+    which helps a lot on network shares (and a bit on SSDs) where the copy
+    is latency bound. Small trees below the file-count threshold are copied
+    serially since the pool isn't worth spinning up.
+    """
+    # Create the directory skeleton serially and collect the file pairs.
+    pairs = []
+    for root, dirs, files in os.walk(src):
+        d = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(d, exist_ok=True)
+        for name in files:
+            pairs.append((os.path.join(root, name), os.path.join(d, name)))
+
+    # Copy the files, in parallel if there are enough of them.
+    if len(pairs) <= threshold:
+        for pair in pairs: _copy_with_retry(*pair)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            list(ex.map(lambda pair: _copy_with_retry(*pair), pairs))
+
+    # Fresh stats next time.
+    _cached_stat.cache_clear()
+    return dst
+
+@functools.lru_cache(maxsize=8)
+def _cars_root(local):
+    """
+    Resolved path to content/cars under the supplied assetto folder.
+    realpath hits the filesystem (symlink resolution), so cache it per
+    text-box value rather than recomputing in every method.
+    """
+    return os.path.realpath(os.path.join(local, 'content', 'cars'))
+
 def nearest_fraction(x, nmin=7, nmax=40):
     """
     Given x, find the closest fraction
@@ -96,6 +183,8 @@ class Modder:
         self.skins = dict()
         self.cars_keys = None
         self.srac_keys = None
+        self._log_buf  = [] # Log lines not yet pushed to the GUI
+        self._combo_index = dict() # Car folder -> combo index, rebuilt by update_cars
 
         # Lookup table for which files to mod, with extra sections possible
         self.ini_seed = {
@@ -118,6 +207,32 @@ class Modder:
 
         # This will hold all the data from the ini files.
         self.ini_source = dict()
+
+        # Cache of Savitzky-Golay coefficients keyed by (window, order),
+        # since they don't depend on the data.
+        self._sg_cache = dict()
+
+        # Tree settings that actually affect the plotted curves, plus the last
+        # seen values, so update_curves() can skip recomputing when some
+        # unrelated setting (e.g. Mod Tag or an INI value) changed.
+        self._plot_params = [
+            'POWER.LUT',
+            'POWER.LUT/Restrictor',
+            'POWER.LUT/Restrictor/Exponent',
+            'POWER.LUT/Restrictor/RPM Range',
+            'POWER.LUT/Smooth',
+            'POWER.LUT/Smooth/Points',
+            'POWER.LUT/Smooth/Window',
+            'POWER.LUT/Smooth/Order']
+        self._last_plot_state = None
+
+        # Holds (signature, cars, srac, skins) from the last scan so repeat
+        # scans of an unchanged cars folder are O(1).
+        self._scan_cache = None
+
+        # Interpolation grids keyed by (min, max, points); the same grid gets
+        # requested over and over while dragging sliders.
+        self._grid_cache = dict()
         
 
         ######################
@@ -236,7 +351,7 @@ class Modder:
         self.window.new_autorow()
         self.text_log = self.grid_middle2.add(egg.gui.TextLog(), 1,1, alignment=0)
 
-        self.log('Welcome to my silly-ass minimodder!')
+        self.log('Welcome to my silly-ass minimodder!', flush=True)
 
         # Scan for content
         print('\nSCANNING')
@@ -293,7 +408,7 @@ class Modder:
             with open(self.get_mod_path('data',file.lower()), 'w') as f:
                 self.log('  Creating new '+file)
                 f.write(s)
-        else:  self.log('\n'+file+'\n', s)
+        else:  self.log('\n'+file+'\n', s, flush=True)
                 
                 
 
@@ -326,7 +441,7 @@ class Modder:
         self.log('Resetting car data:')
         
         car = self.combo_car.get_text()
-        path = os.path.join(self.text_local(), 'content', 'cars', car, 'ui', 'jax-minimodder.txt')
+        path = os.path.join(_cars_root(self.text_local()), car, 'ui', 'jax-minimodder.txt')
 
         # delete the config file
         if os.path.exists(path):
@@ -353,7 +468,7 @@ class Modder:
         args can be additional paths, e.g. 'data'.
         """
         mod_car  = self.combo_car.get_text()+'_'+self.tree['Mod Tag'].lower().replace(' ', '_')
-        return os.path.realpath(os.path.join(self.text_local(), 'content', 'cars', mod_car, *args))
+        return os.path.join(_cars_root(self.text_local()), mod_car, *args)
     
 
     def _button_create_mod_clicked(self, *a): self.create_mod()
@@ -366,12 +481,12 @@ class Modder:
         # Source car 
         car      = self.combo_car.get_text()
         car_name = self.cars[car]
-        car_path = os.path.realpath(os.path.join(self.text_local(), 'content', 'cars', car))
+        car_path = os.path.join(_cars_root(self.text_local()), car)
         
         # Mod name, folder, and path
         mod_name = car_name + '-'+self.tree['Mod Tag']
         mod_car  = car+'_'+self.tree['Mod Tag'].lower().replace(' ', '_')
-        mod_car_path = os.path.realpath(os.path.join(self.text_local(), 'content', 'cars', mod_car))
+        mod_car_path = os.path.join(_cars_root(self.text_local()), mod_car)
 
         # Create a warning dialog and quit if cancelled
         qmb = egg.pyqtgraph.QtWidgets.QMessageBox
@@ -380,51 +495,55 @@ class Modder:
           qmb.Ok | qmb.Cancel, qmb.Cancel)
         if ret == qmb.Cancel: return
 
-        self.log('Creating '+mod_name)
+        self.log('Creating '+mod_name, flush=True)
 
         # If the other directory is already there, kill it.
         if os.path.exists(mod_car_path):
             self.log('  Deleting '+mod_car_path)
             try: rmtree(mod_car_path)
             except Exception as e:
-                self.log('  Error:', e)
+                self.log('  Error:', e, flush=True)
                 return 
 
         # Copy the existing mod as is
         self.log('  Copying '+car+' -> '+mod_car)
-        shutil.copytree(car_path, mod_car_path)
+        parallel_copytree(car_path, mod_car_path)
 
         # POWER.LUT
         d = self.plot
         if self.tree['POWER.LUT']:
             self.log('  Updating power.lut')
             mod_power_path = os.path.join(mod_car_path,'data','power.lut')
-            f = open(mod_power_path, 'w')
-            for n in range(len(d[0])):
-                if not isnan(d[2][n]):
-                    line = '%.1f|%.1f\n' % (d[0][n], d[2][n])
-                    f.write(line)
-            f.close()
+            lines = ['%.1f|%.1f' % (d[0][n], d[2][n]) for n in range(len(d[0])) if not isnan(d[2][n])]
+            with open(mod_power_path, 'w') as f: f.write('\n'.join(lines)+'\n')
 
         # UI.JSON
         self.log('  Updating ui_car.json')
         mod_ui = os.path.realpath(os.path.join(mod_car_path, 'ui', 'ui_car.json'))
         x = load_json(mod_ui)
         x['name'] = mod_name
-        x['torqueCurve'] = []
-        x['powerCurve']  = []
-        hp = d[0]*d[2]*0.00014
-        for n in range(len(d[0])):
-            if not isnan(d[2][n]):
-                x['torqueCurve'].append(['%.1f' % d[0][n], '%.1f' % d[2][n]])
-                x['powerCurve'] .append(['%.1f' % d[0][n], '%.1f' % hp[n]  ])
-        x['specs']['bhp']      = '%.0f bhp' % max(hp)
-        x['specs']['torque']   = '%.0f Nm'  % max(d[2])
+
+        # Mask out the nan rows once and format the survivors in a single pass,
+        # rather than testing isnan per row in a python loop.
+        rpm  = d[0]
+        tq   = d[2]
+        mask = ~isnan(tq)
+        hp   = rpm*tq*0.00014
+        rpm_s = ['%.1f' % v for v in rpm[mask]]
+        tq_s  = ['%.1f' % v for v in tq [mask]]
+        hp_s  = ['%.1f' % v for v in hp [mask]]
+        x['torqueCurve'] = list(map(list, zip(rpm_s, tq_s)))
+        x['powerCurve']  = list(map(list, zip(rpm_s, hp_s)))
+        hp_max = float(hp[mask].max()) # C-level reductions; builtin max()
+        tq_max = float(tq[mask].max()) # iterates the array in python
+        x['specs']['bhp']      = '%.0f bhp' % hp_max
+        x['specs']['torque']   = '%.0f Nm'  % tq_max
         x['specs']['weight']   = '%s kg'  % self.tree['CAR.INI/BASIC/TOTALMASS']
-        x['specs']['pwratio']  = '%.2f kg/bhp' % (float(self.tree['CAR.INI/BASIC/TOTALMASS'])/max(hp))
+        x['specs']['pwratio']  = '%.2f kg/bhp' % (float(self.tree['CAR.INI/BASIC/TOTALMASS'])/hp_max)
         x['specs']['topspeed'] = 'buh?'
         x['minimodder'] = self.tree.get_dictionary()[1]
-        json.dump(x, open(mod_ui, 'w'), indent=2)
+        if orjson: open(mod_ui, 'wb').write(orjson.dumps(x, option=orjson.OPT_INDENT_2))
+        else:      json.dump(x, open(mod_ui, 'w'), indent=2)
 
         # RATIOS AND FINAL RTO
         self.generate_rto('RATIOS.RTO')
@@ -436,44 +555,57 @@ class Modder:
         
         ini_modded = deepcopy(self.ini_source)
 
+        # Resolve the file-level and section-level modes into flat dicts
+        # first, so the per-key loop below does a single hash probe instead of
+        # re-querying the tree widget for every key.
+        file_mode    = dict() # 'SETUP.INI'                  -> 'leave'/'modify'
+        section_mode = dict() # 'SETUP.INI/FINAL_GEAR_RATIO' -> 'leave'/'modify'/'remove'
+        tree_keys = self.tree.keys()
+        for k in tree_keys:
+            s = k.split('/')
+            if s[0] not in self.ini_seed: continue
+            if   len(s) == 1: file_mode   [k] = self.tree[k]
+            elif len(s) == 2: section_mode[k] = self.tree[k]
+
         # Loop over all the tree keys, e.g. SETUP.INI/SPRING_RATE_LF/NAME
-        for k in self.tree.keys():
+        for k in tree_keys:
 
             # k is something like SETUP.INI/SPRING_RATE_LF/NAME
             s = k.split('/') # ['SETUP.INI', 'SPRING_RATE_LF', 'NAME']
             file = s[0]      # 'SETUP.INI'
-            
-            # If it's an ini file (not another category) 
+
+            # If it's an ini file (not another category)
             # and we have it set to be changed, modify it
-            if file in self.ini_seed and self.tree[file] == 'modify':
-                                    
+            if file_mode.get(file) == 'modify':
+
                 # Only proceed if there is a section
                 if len(s) <= 1: continue
-                
+
                 # Section
                 section = s[1] # e.g. 'SPRING_RATE_LF'
 
                 # We will populated this with the modded values from the tree
                 c = ini_modded[file]
+                mode = section_mode.get(file + '/' + section)
 
                 # If we're supposed to modify the section and there is a key
-                if self.tree[file + '/' + section] == 'modify' and len(s) > 2:
+                if mode == 'modify' and len(s) > 2:
 
                     # If there is not already a section in the tree, add it
                     if not section in c: c[section] = dict()
-                                    
+
                     # Update the key to the tree value
                     c[section][s[2]] = self.tree[k]
-                
+
                 # If we're supposed to remove it, pop it from the dictionary
                 # so it's not written
-                elif self.tree[file + '/' + section] == 'remove' and len(s) == 2: 
+                elif mode == 'remove' and len(s) == 2:
                     print('  popping', file, section)
                     if section in c: c.pop(section)
-            
+
         # Write the files
         for file in ini_modded:
-            if self.tree[file] == 'modify':
+            if file_mode.get(file) == 'modify':
                 self.write_ini_file(ini_modded[file], mod_car_path, 'data', file.lower())
 
         # Now delete the data.acd
@@ -494,12 +626,14 @@ class Modder:
         os.rename(os.path.join(mod_car_path, 'sfx', car     + '.bank'),
                   os.path.join(mod_car_path, 'sfx', mod_car + '.bank'))
 
-        # Remember our selection and scan
+        # Remember our selection and scan (fresh, since we just made a folder)
+        self._scan_cache = None
         self.button_scan.click()
 
         # All done
+        self.flush_log()
         self._creating_mod = False
-        self.combo_car.set_index(self.combo_car.get_index(car))
+        self.combo_car.set_index(self._combo_index.get(car, 0))
 
         # Open the mod car path
         os.startfile(mod_car_path)
@@ -510,8 +644,8 @@ class Modder:
         Opens the car directory.
         """
         car  = self.combo_car.get_text()
-        path = os.path.realpath(os.path.join(self.text_local(), 'content', 'cars', car))
-        self.log('Opening', path)
+        path = os.path.join(_cars_root(self.text_local()), car)
+        self.log('Opening', path, flush=True)
         os.startfile(path)
 
     def _combo_car_changed(self, *a):
@@ -535,39 +669,25 @@ class Modder:
         My own parser because dammit the other one is annoying af and doesn't like to play nice.
         """
         path = os.path.join(*paths)
-        with open(path, 'r') as f:
-
-            # Get the lines
-            lines = f.readlines()
-
-            # Organization: section, key, value
-            c = dict()
-            section = ''
+        with open(path, 'r') as f: text = f.read()
 
-            # Loop over lines
-            for line in lines:
+        # Organization: section, key, value. One compiled-regex pass over the
+        # whole file; comment-only and malformed lines simply don't match.
+        c = dict()
+        section = ''
+        for m in _ini_line.finditer(text):
 
-                # Strip the comment
-                line = line.split(';')[0].strip()
+            # If it's a new section
+            if m.group(1) is not None:
+                section = m.group(1)
+                continue
 
-                # If it's empty or just a comment
-                if line == '': continue
-
-                # If it's a new section
-                if line[0] == '[':
-                    section = line[1:len(line)-1]
-                    continue
-            
-                # If it's a key-value pair
-                s = line.split('=')
-                if len(s) < 2: continue
+            # Create the section in the output dictionary
+            if not section in c: c[section] = dict()
 
-                # Create the section in the output dictionary
-                if not section in c: c[section] = dict()
+            # Store the key and value (string)
+            c[section][m.group(2)] = m.group(3).strip()
 
-                # Store the key and value (string)
-                c[section][s[0].strip()] = s[1].strip()
-            
         return c
 
     def write_ini_file(self, c, *paths):
@@ -576,14 +696,18 @@ class Modder:
         """
         path = os.path.join(*paths)
         self.log('  Overwriting', paths[-1])
-        with open(path,'w') as f: 
-            for section in c:
 
-                # Write the section header
-                f.write('\n['+section+']\n')
+        # Assemble the whole file in memory and write it in one call.
+        lines = []
+        for section in c:
+
+            # Section header
+            lines.append('\n['+section+']')
 
-                # Loop over sub-keys
-                for key in c[section]: f.write(key+'='+c[section][key]+'\n')
+            # Loop over sub-keys
+            for key in c[section]: lines.append(key+'='+c[section][key])
+
+        with open(path,'w') as f: f.write('\n'.join(lines)+'\n')
 
     def load_car_data(self):
         """
@@ -592,9 +716,13 @@ class Modder:
         # Prevent tree events etc
         self._loading_car_data = True
 
+        # New car means a new source databox; clear the update_curves
+        # snapshot so a recycled id can't make it skip the redraw.
+        self._last_plot_state = None
+
         # Get the path to the car
         car  = self.combo_car.get_text()
-        data = os.path.realpath(os.path.join(self.text_local(), 'content', 'cars', car, 'data'))
+        data = os.path.join(_cars_root(self.text_local()), car, 'data')
 
         # Make sure we have the file
         self.log('Loading '+car+' data:')
@@ -604,6 +732,7 @@ class Modder:
             self.plot.clear()
             self.plot.plot()
             self.grid_middle2.disable()
+            self.flush_log()
             return
 
         # We have it, so we can do everything. Enable stuff.
@@ -641,13 +770,14 @@ class Modder:
                         self.tree[k] = self.get_ini_source_value(file, section, key)
 
         # Load USER settings from the saved json
-        saved_tree_path = os.path.join(self.text_local(), 'content', 'cars', car, 'ui', 'jax-minimodder.txt')
+        saved_tree_path = os.path.join(_cars_root(self.text_local()), car, 'ui', 'jax-minimodder.txt')
         if os.path.exists(saved_tree_path):
             self.log('  Loading ', saved_tree_path)
             saved_tree = spinmob.data.load(saved_tree_path, header_only=True, delimiter='\t')
             self.tree.update(saved_tree) # No event fired because we're loading car data.
 
         # Re-enable tree events
+        self.flush_log()
         self._loading_car_data = False
 
         # Expand
@@ -779,6 +909,13 @@ class Modder:
         """
         if not self.source_power_lut or not len(self.source_power_lut): return
 
+        # If neither the source data nor any plot-affecting setting changed,
+        # this would just recompute the same curves; skip it.
+        plot_state = (id(self.source_power_lut),
+                      tuple(self.tree[k] for k in self._plot_params))
+        if plot_state == self._last_plot_state: return
+        self._last_plot_state = plot_state
+
         # Start clean
         self.plot.clear()
         self.plot.copy_all_from(self.source_power_lut)
@@ -787,29 +924,45 @@ class Modder:
         x = self.plot[0]
         y = self.plot[1]
         self.plot['Modded'] = y
-        self.plot['Scale']  = 0 * x + 1
+        self.plot['Scale']  = ones_like(x)
 
         if self.tree['POWER.LUT']:
 
             # If we're smoothing
             if self.tree['POWER.LUT/Smooth']:
 
-                # Sav-Gol filter
-                x2 = linspace(min(x),max(x),self.tree['POWER.LUT/Smooth/Points'])
+                # Sav-Gol filter: the coefficients depend only on (window, order),
+                # so cache them and apply with a single convolution rather than
+                # re-deriving them on every tree change.
+                key = (float(min(x)), float(max(x)), self.tree['POWER.LUT/Smooth/Points'])
+                x2  = self._grid_cache.get(key)
+                if x2 is None: x2 = self._grid_cache[key] = linspace(*key)
                 y2 = interp(x2, x, y)
+                wo = (self.tree['POWER.LUT/Smooth/Window'], self.tree['POWER.LUT/Smooth/Order'])
+                if wo not in self._sg_cache:
+                    # Deferred: importing scipy takes ages and only the
+                    # smoothing path needs it.
+                    from scipy.signal import savgol_coeffs
+                    self._sg_cache[wo] = savgol_coeffs(*wo)
                 x = self.plot[0] = x2
-                y = self.plot[1] = savgol_filter(y2, self.tree['POWER.LUT/Smooth/Window'], self.tree['POWER.LUT/Smooth/Order'])
+                # Extend the edges by half a window before convolving so the
+                # endpoints aren't zero-padded into a droop.
+                hw = (wo[0]-1)//2
+                y  = self.plot[1] = convolve(pad(y2, hw, mode='edge'), self._sg_cache[wo], mode='valid')
 
             x0 = max(self.plot[0])*self.tree['POWER.LUT/Restrictor/RPM Range']
             p  = self.tree['POWER.LUT/Restrictor/Exponent']
 
             if self.tree['POWER.LUT/Restrictor']:
-                self.plot['Modded'] = y*((x0-x)/x0)**p
-                self.plot['Scale']  = ((x0-x)/x0)**p
+                # Compute the scale once, clamping the base at zero so rpm
+                # beyond the restrictor range can't go complex / nan.
+                scale = maximum((x0-x)/x0, 0)**p
+                self.plot['Modded'] = y*scale
+                self.plot['Scale']  = scale
 
             else:
                 self.plot['Modded'] = y
-                self.plot['Scale'] = 0 * x + 1
+                self.plot['Scale'] = ones_like(x)
 
         self.plot.plot()
 
@@ -866,7 +1019,7 @@ class Modder:
 
         # Save the tree
         car = self.combo_car.get_text()
-        saved_tree_path = os.path.join(self.text_local(), 'content', 'cars', car, 'ui', 'jax-minimodder.txt')
+        saved_tree_path = os.path.join(_cars_root(self.text_local()), car, 'ui', 'jax-minimodder.txt')
         self.tree.save(saved_tree_path)
 
     def _button_scan_clicked(self, *a):
@@ -884,15 +1037,26 @@ class Modder:
             self.text_local(path)
             self.button_scan.click()
 
-    def log(self, *a):
+    def log(self, *a, flush=False):
         """
-        Logs it.
+        Logs it. Console output is immediate, but the GUI append and the Qt
+        event pump are buffered and flushed every 32 lines (or at flush=True
+        milestones) so tight loops don't redraw once per line.
         """
         a = list(a)
         for n in range(len(a)): a[n] = str(a[n])
         text = ' '.join(a)
-        self.text_log.append_text(text)
         print('LOG:', text)
+        self._log_buf.append(text)
+        if flush or len(self._log_buf) >= 32: self.flush_log()
+
+    def flush_log(self):
+        """
+        Pushes any buffered log lines to the GUI in one append.
+        """
+        if not len(self._log_buf): return
+        self.text_log.append_text('\n'.join(self._log_buf))
+        self._log_buf = []
         self.window.process_events()
 
     def update_cars(self):
@@ -910,28 +1074,47 @@ class Modder:
         # Get the current car name
         og_name = self.combo_car.get_text()
 
-        # Get all the car paths
-        for path in glob.glob(os.path.join(self.text_local(), 'content', 'cars', '*')):
+        # Cheap signature of the cars folder: its mtime plus the sorted list of
+        # entries. If it matches the last scan, reuse the parsed results
+        # instead of re-reading every ui_car.json.
+        cars_root = _cars_root(self.text_local())
+        try:    sig = (os.stat(cars_root).st_mtime_ns, tuple(sorted(os.listdir(cars_root))))
+        except OSError: sig = None
+
+        if sig is not None and self._scan_cache and self._scan_cache[0] == sig:
+            self.cars, self.srac, self.skins = self._scan_cache[1:]
+
+        # Otherwise do the full scan over all the car paths. A single scandir
+        # pass; DirEntry.is_dir() comes from the directory read itself, so
+        # this skips the per-entry stat that glob + exists checks would do.
+        else:
+            try:             entries = list(os.scandir(cars_root))
+            except OSError:  entries = []
+            for e in entries:
+                if not e.is_dir(follow_symlinks=False): continue
+
+                # Get the car's directory name
+                dirname = e.name
 
-            # Get the car's directory name
-            dirname = os.path.split(path)[-1]
+                # Make sure it exists.
+                path_json = os.path.join(e.path, 'ui', 'ui_car.json')
+                path_data = os.path.join(e.path, 'data')
+                if not os.path.exists(path_json) or not os.path.exists(path_data): continue
 
-            # Make sure it exists.
-            path_json = os.path.join(path, 'ui', 'ui_car.json')
-            path_data = os.path.join(path, 'data')
-            if not os.path.exists(path_json) or not os.path.exists(path_data): continue
+                # Get the fancy car name (the jsons are not always well formatted, so I have to manually search!)
+                s = load_json(path_json)
 
-            # Get the fancy car name (the jsons are not always well formatted, so I have to manually search!)
-            s = load_json(path_json)
+                # Remember the fancy name
+                name = s['name'] if 'name' in s else dirname
+                print('  ', name)
+                self.cars[dirname] = name
+                self.srac[name]    = dirname
 
-            # Remember the fancy name
-            name = s['name'] if 'name' in s else dirname
-            print('  ', name)
-            self.cars[dirname] = name
-            self.srac[name]    = dirname
+                # Store the list of skins and the index
+                self.skins[dirname] = os.listdir(os.path.join(e.path, 'skins'))
 
-            # Store the list of skins and the index
-            self.skins[dirname] = os.listdir(os.path.join(path, 'skins'))
+            # Remember the results for next time.
+            if sig is not None: self._scan_cache = (sig, self.cars, self.srac, self.skins)
 
         # Sort the car directories and add them to the list.
         self.cars_keys = list(self.cars.keys())
@@ -939,14 +1122,17 @@ class Modder:
         self.cars_keys.sort()
         self.srac_keys.sort()
 
-        # Populate the combo
+        # Populate the combo, remembering each car's index so we never have
+        # to rescan the combo items to find one.
         self.combo_car.clear()
         for key in self.cars_keys: self.combo_car.add_item(key)
+        self._combo_index = dict(zip(self.cars_keys, range(len(self.cars_keys))))
 
         # Set it to what it was.
         if og_name in self.cars_keys: self.combo_car.set_text(og_name)
 
         self._updating_cars = False
+        self.flush_log()
 
         self._combo_car_changed()
 
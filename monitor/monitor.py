@@ -11,8 +11,14 @@
 # HANDLE Join link error: <https://acstuff.ru/s/q:race/online/join?ip=upstream connect error or disconnect/reset before headers. retried and the latest reset reason: connection failure&httpPort=8082>)
 # Race servers show EVERYONE online at the same time, even if they aren't.
 
-import os, json, discord, shutil, pprint, glob, time, datetime, urllib, dateutil.parser, socket, requests, ipaddress
+import os, json, re, discord, shutil, pprint, glob, time, datetime, urllib, dateutil.parser, socket, requests, ipaddress
+import queue, threading, functools, hashlib
 from numpy import median
+from collections import deque, defaultdict
+
+# Optional fast json; we fall back to the stdlib without complaint.
+try:    import orjson
+except ImportError: orjson = None
 from copy import deepcopy
 
 # Change to the directory of this script
@@ -151,6 +157,24 @@ def auto_week(t0):
     # Return the timestamp
     return tf.timestamp()
 
+# Pulls the name and time out of e.g. 'LAP Driver Name 1:23:456' in one pass,
+# skipping the 'LAP WITH CUTS' variant.
+_LAP_RE  = re.compile(r'^LAP (?!WITH CUTS)(.*) (\S+)\s*$')
+_CUTS_RE = re.compile(r'Cuts:\s*(\d+)')
+
+# key=value pairs in the CALLING line's query string
+_QUERY_RE = re.compile(r'([^&=]+)=([^&=]*)')
+
+@functools.lru_cache(maxsize=4096)
+def to_ms(s):
+    """
+    Given string s (e.g., '47:21:123'), return an integer number of ms.
+
+    Lap-time strings repeat a lot, so this is memoized.
+    """
+    s = s.split(':')
+    return int(s[0])*60000 + int(s[1])*1000 + int(s[2])
+
 def tail(f, start_from_end=False):
     """
     Function that tails the supplied file stream.
@@ -163,11 +187,19 @@ def tail(f, start_from_end=False):
     # Go to the end of the file
     if start_from_end: f.seek(0,2) 
 
-    # This goes on indefinitely
+    # This goes on indefinitely. readline() can return a partial line if the
+    # server is mid-write, so hold onto fragments until the newline arrives.
+    # Yields None when the file goes quiet so the consumer can tidy up.
+    partial = ''
     while True:
         line = f.readline()
-        if line: yield line
-        else:    time.sleep(1.0)
+        if not line:
+            yield None
+            time.sleep(1.0)
+        elif line.endswith('\n'):
+            yield partial + line
+            partial = ''
+        else: partial += line
 
 
 def load_json(path, suppress_warning=False):
@@ -180,6 +212,11 @@ def load_json(path, suppress_warning=False):
         if not suppress_warning: log('load_json: could not find', path)
         return
     try:
+        # orjson is much faster but strict; fall back to the forgiving
+        # stdlib parse if it balks.
+        if orjson:
+            try:    return orjson.loads(open(path, 'rb').read())
+            except Exception: pass
         f = open(path, 'r', encoding='utf8', errors='replace')
         j = json.load(f, strict=False)
         f.close()
@@ -198,7 +235,7 @@ def port_is_open(host, port, timeout=5):
         s.connect((host, port))
         s.close()
 
-    except: return False
+    except OSError: return False
 
     return True
 
@@ -234,6 +271,28 @@ class Monitor:
         if url_webhook_info: 
             self.webhook_info = discord.SyncWebhook.from_url(url_webhook_info)
 
+        # Background worker so slow Discord deletes don't stall log parsing.
+        self._webhook_queue = queue.Queue()
+        threading.Thread(target=self._webhook_worker, daemon=True).start()
+
+        # Debounce bookkeeping for save_and_archive_state()
+        self._state_dirty      = False
+        self._last_state_flush = 0
+
+        # Digest of the last state.json bytes we wrote, for no-op detection
+        self._last_state_digest = None
+
+        # Lap-sort caching: bumped whenever laps (or the car/carset data the
+        # sorts depend on) change, so the sorts can reuse their last result.
+        self._laps_version = 0
+        self._sort_cache   = dict()
+
+        # State file locations; create the directories once here rather than
+        # stat()ing them on every save.
+        self._path_state   = os.path.join('web', 'state.json')
+        self._path_archive = os.path.join('web', 'archive')
+        os.makedirs(self._path_archive, exist_ok=True)
+
         # Reset the state to start
         self.reset_state()
 
@@ -247,6 +306,19 @@ class Monitor:
                 log('\nFOUND state.json, loaded')
                 pprint.pprint(self.state)
 
+                # json gives us plain dicts; rewrap so lap insertion can
+                # rely on auto-created name entries.
+                self.state['laps']      = defaultdict(dict, self.state['laps'])
+                self.state['naughties'] = defaultdict(dict, self.state['naughties'])
+                self._laps_version += 1
+
+                # Backfill time_ms for laps saved by old versions, since
+                # the sorts below rely on it.
+                for name in self['laps']:
+                    for car in self['laps'][name]:
+                        c = self['laps'][name][car]
+                        if 'time_ms' not in c: c['time_ms'] = to_ms(c['time'])
+
                 # May as well update once at the beginning, in case something changed
                 # Note we cannot do this without state having track.
                 self.load_ui_data()
@@ -262,6 +334,7 @@ class Monitor:
             # Get all the latest data from the server
             while True:
                 self.premium_get_latest_data()
+                self.flush_state()
                 time.sleep(3)
 
         # Vanilla server
@@ -270,13 +343,15 @@ class Monitor:
                 logs = glob.glob(os.path.join(path_log,'*'))
                 path_log = max(logs, key=os.path.getctime)
 
-            # Parse the existing log and incorporate ui data
-            self.vanilla_parse_lines(open(path_log, 'r', encoding="utf8").readlines(), True)
+            # Parse the existing log and incorporate ui data. Stream it with a
+            # big buffer rather than pulling months of log into memory at once.
+            with open(path_log, 'r', encoding="utf8", buffering=1<<20) as f:
+                self.vanilla_parse_lines(f, True)
             self.load_ui_data()
 
             # Send and save
             self.send_state_messages()
-            self.save_and_archive_state()
+            self.save_and_archive_state(force=True)
 
             # Monitor the file, but don't bother if we're just debugging.
             if not debug:
@@ -293,6 +368,7 @@ class Monitor:
         """
         Resets to state defaults (empty).
         """
+        self._laps_version += 1
         self.state = dict(
             online=dict(),  # Dictionary of online user info, indexed by name = {car:'car_dir'}
             online_message_id=None,  # Message id for the "who is online" messages
@@ -312,8 +388,8 @@ class Monitor:
             down_message_id=None,  # id of the discord message about whether the server is down
 
             archive_path=None,  # Path to the archive of state.json
-            laps=dict(),  # Dictionary by name of valid laps for this track / layout
-            naughties=dict(),  # Dictionary by name of cut laps
+            laps=defaultdict(dict),  # Dictionary by name of valid laps for this track / layout
+            naughties=defaultdict(dict),  # Dictionary by name of cut laps
             carset=None,  # carset if possible to determine
             carsets=dict(),  # Dictionary of car lists by carset name for grouping laps
             stesrac=dict(),  # Dictionary of carset name lists by car for grouping laps
@@ -685,8 +761,6 @@ class Monitor:
                     #   the lap count is different
                     # update the laps for this car and driver.
                     if best and best > 100: # 100 ms minimum time to catch glitches.
-                        if name not in self['laps']: self['laps'][name] = dict()
-
                         if car not in self['laps'][name]   \
                         or best < self['laps'][name][car]['time_ms'] \
                         or 'count' not in self['laps'][name][car]    \
@@ -705,6 +779,7 @@ class Monitor:
                             )
 
                             log('Lap:', name, car, self['laps'][name][car])
+                            self._laps_version += 1
 
                             # Remember to update the messages
                             laps_or_onlines_changed = True
@@ -729,147 +804,185 @@ class Monitor:
         or a sh.tail() call (infinite).
         """
 
+        # Dispatch table for the line prefixes we care about; first match wins,
+        # in the same order as the old if-elif chain.
+        handlers = [
+            ('REQUESTED CAR:',                  self._on_requested_car),
+            ('DRIVER:',                         self._on_driver),
+            ('Clean exit, driver disconnected', self._on_clean_exit),
+            ('Connection is now closed',        self._on_connection_closed),
+            ('Result.OnLapCompleted',           self._on_lap_completed),
+            ('CALLING ',                        self._on_calling),
+            ('Assetto Corsa Dedicated Server',  self._on_new_log),
+        ]
+
+        # First characters of the above, for cheaply skipping the (vast
+        # majority of) lines that can't match any prefix.
+        first_chars = frozenset(prefix[0] for prefix, handler in handlers)
+
         # Listen for file changes
         self.last_requested_car = None # String last requested car for new drivers
-        self.history            = []   # List of recent lines, 0 being the latest
+        self.history            = deque(maxlen=10) # Recent lines, 0 being the latest
         for line in lines:
 
-            # Update the line history
-            self.history.insert(0, line)
-            while len(self.history) > 10: self.history.pop()
+            # tail() yields None when the log goes quiet; use the lull to
+            # flush any debounced state write.
+            if line is None:
+                self.flush_state()
+                continue
 
-            # Requested car comes first when someone connects.
-            # REQUESTED CAR: ac_legends_gtc_shelby_cobra_comp*
-            if line.find('REQUESTED CAR:') == 0:
-                log('\n'+line.strip())
-
-                # Get the car directory
-                car = line[14:].replace('*','').strip()
-
-                # Use the raw name. Will be converted with look-up table for
-                # messages.
-                self.last_requested_car = car
-
-            # Driver name comes toward the end of someone connecting
-            # DRIVER: Driver Name []
-            elif line.find('DRIVER:') == 0:
-                log('\n'+line.strip())
-                self.vanilla_driver_connects(line[7:].split('[')[0].strip(), self.last_requested_car, init)
-
-            # Clean exit, driver disconnected:  Driver Name []
-            elif line.find('Clean exit, driver disconnected') == 0:
-                log('\n'+line.strip())
-                self.vanilla_driver_disconnects(line[33:].split('[')[0].strip(), init)
-
-            # Connection is now closed for Driver Name []
-            elif line.find('Connection is now closed') == 0:
-                log('\n'+line.strip())
-                self.vanilla_driver_disconnects(line[28:].split('[')[0].strip(), init)
-
-            # Lap completed
-            # Result.OnLapCompleted. Cuts: 7 ---
-            elif line.find('Result.OnLapCompleted') == 0:
-                log('\n'+line.strip())
-
-                # Get the number of cuts (0 is valid)
-                cuts = int(line.split('Cuts:')[-1])
-
-                # Get the laps key 'laps' for good laps, 'naughties' for cut laps.
-                if cuts: laps = 'naughties'
-                else:    laps = 'laps'
-
-                # Get the driver name and time from the history
-                for l in self.history:
-                    if l.find('LAP ') == 0 and l.find('LAP WITH CUTS') != 0:
-
-                        # Split the interesting part by space, get the time and name
-                        s = l[4:].split(' ') # List of elements
-                        t = s.pop(-1).strip()   # Time string
-                        n = ' '.join(s)         # Name
-
-                        log('  ->', repr(t), repr(n), cuts, 'cuts')
-
-                        # Get the new time in ms
-                        t_ms = self.to_ms(t)
-
-                        # Make sure this name is in the state
-                        if not n in self[laps]: self[laps][n] = dict()
-
-                        # Should never happen, but if the person is no longer online, poop out.
-                        if not n in self['online']:
-                            log('  WEIRD: DRIVER OFFLINE NOW??')
-                            break
-
-                        # Get the car for the online person with this name
-                        c = self['online'][n]['car']
-
-                        # Structure:
-                        # state[laps][n][car] = {'time': '12:32:032', 'time_ms':12345, 'cuts': 3}
-
-                        # If the time is better than the existing or no entry exists
-                        # Update it! Eliminate some bug laps by enforcing more than 1 second.
-                        if (not c in self[laps][n] or t_ms < self[laps][n][c]['time_ms']) \
-                        and t_ms > 1000:
-
-                            self[laps][n][c] = dict(time=t, time_ms=t_ms, cuts=cuts)
-                            if not init: 
-                                self.save_and_archive_state()
-                                self.send_state_messages()
-
-                        # No need to keep looping through the history.
-                        break
-
-            # Check if track or carset has changed from the CALLING line after initialization
-            elif line.find('CALLING ') == 0:
-                log('\n'+line.strip())
-
-                # Split off the ? then split by &
-                items = line.split('?')[1].split('&')
-
-                # Make the items into a dictionary
-                for item in items:
-                    s = item.split('=')
-                    if(len(s) > 1):
-
-                        # Cars list
-                        if s[0] == 'cars':
-                            cars = s[1].split('%2C')
-                            log('  Cars:', cars)
-
-                        # Track directory and layout, e.g. ks_barcelona-gp
-                        elif s[0] == 'track':
-                            tl = s[1].split('-')
-                            track = tl[0]
-                            if len(tl) > 1: layout = tl[1]
-                            else:           layout = None
-                            log('  Track:', track, layout)
-
-                # If we have (entirely!) new cars or new track, initialize that.
-                if len(set(cars).intersection(self['cars'])) == 0 \
-                or track != self['track']     \
-                or layout    != self['layout']:
-                    self.new_venue(track, layout, cars)
-                    
-                    # If this isn't the initial parse, save, delete, and send.
-                    if not init:
-                        # Archive it
+            # Update the line history; the deque drops the oldest for us.
+            self.history.appendleft(line)
+
+            # One set test rules out most lines before the prefix scan.
+            if not line or line[0] not in first_chars: continue
+
+            # Hand the line to the first handler whose prefix matches.
+            for prefix, handler in handlers:
+                if line.startswith(prefix):
+                    handler(line, init)
+                    break
+
+    def _on_requested_car(self, line, init):
+        """
+        Requested car comes first when someone connects.
+        REQUESTED CAR: ac_legends_gtc_shelby_cobra_comp*
+        """
+        log('\n'+line.strip())
+
+        # Get the car directory
+        car = line[14:].replace('*','').strip()
+
+        # Use the raw name. Will be converted with look-up table for
+        # messages.
+        self.last_requested_car = car
+
+    def _on_driver(self, line, init):
+        """
+        Driver name comes toward the end of someone connecting
+        DRIVER: Driver Name []
+        """
+        log('\n'+line.strip())
+        self.vanilla_driver_connects(line[7:].split('[')[0].strip(), self.last_requested_car, init)
+
+    def _on_clean_exit(self, line, init):
+        """
+        Clean exit, driver disconnected:  Driver Name []
+        """
+        log('\n'+line.strip())
+        self.vanilla_driver_disconnects(line[33:].split('[')[0].strip(), init)
+
+    def _on_connection_closed(self, line, init):
+        """
+        Connection is now closed for Driver Name []
+        """
+        log('\n'+line.strip())
+        self.vanilla_driver_disconnects(line[28:].split('[')[0].strip(), init)
+
+    def _on_lap_completed(self, line, init):
+        """
+        Lap completed
+        Result.OnLapCompleted. Cuts: 7 ---
+        """
+        log('\n'+line.strip())
+
+        # Get the number of cuts (0 is valid)
+        cuts = int(_CUTS_RE.search(line).group(1))
+
+        # Get the laps key 'laps' for good laps, 'naughties' for cut laps.
+        if cuts: laps = 'naughties'
+        else:    laps = 'laps'
+
+        # Get the driver name and time from the history
+        for l in self.history:
+            m = _LAP_RE.match(l)
+            if m:
+
+                # One compiled-regex pass gets both pieces
+                n = m.group(1) # Name
+                t = m.group(2) # Time string
+
+                log('  ->', repr(t), repr(n), cuts, 'cuts')
+
+                # Get the new time in ms
+                t_ms = to_ms(t)
+
+                # Should never happen, but if the person is no longer online, poop out.
+                if not n in self['online']:
+                    log('  WEIRD: DRIVER OFFLINE NOW??')
+                    break
+
+                # Get the car for the online person with this name
+                c = self['online'][n]['car']
+
+                # Structure:
+                # state[laps][n][car] = {'time': '12:32:032', 'time_ms':12345, 'cuts': 3}
+
+                # If the time is better than the existing or no entry exists
+                # Update it! Eliminate some bug laps by enforcing more than 1 second.
+                if (not c in self[laps][n] or t_ms < self[laps][n][c]['time_ms']) \
+                and t_ms > 1000:
+
+                    self[laps][n][c] = dict(time=t, time_ms=t_ms, cuts=cuts)
+                    self._laps_version += 1
+                    if not init: 
                         self.save_and_archive_state()
-                
-                        # Send the venue inform message
                         self.send_state_messages()
-                    
-                # Otherwise, load the json data for tracks and cars to cover some changes in car stuff
-                else: self.load_ui_data()
 
-                # Regardless, update the cars
-                self['cars'] = cars
+                # No need to keep looping through the history.
+                break
+
+    def _on_calling(self, line, init):
+        """
+        Check if track or carset has changed from the CALLING line after initialization
+        """
+        log('\n'+line.strip())
+
+        # Split off the ? and pull out the key=value pairs in one
+        # compiled-regex pass.
+        for m in _QUERY_RE.finditer(line.split('?')[1]):
+
+            # Cars list
+            if m.group(1) == 'cars':
+                cars = m.group(2).split('%2C')
+                log('  Cars:', cars)
+
+            # Track directory and layout, e.g. ks_barcelona-gp
+            elif m.group(1) == 'track':
+                tl = m.group(2).split('-')
+                track = tl[0]
+                if len(tl) > 1: layout = tl[1]
+                else:           layout = None
+                log('  Track:', track, layout)
+
+        # If we have (entirely!) new cars or new track, initialize that.
+        if len(set(cars).intersection(self['cars'])) == 0 \
+        or track != self['track']     \
+        or layout    != self['layout']:
+            self.new_venue(track, layout, cars)
+            
+            # If this isn't the initial parse, save, delete, and send.
+            if not init:
+                # Archive it
+                self.save_and_archive_state()
+        
+                # Send the venue inform message
+                self.send_state_messages()
+            
+        # Otherwise, load the json data for tracks and cars to cover some changes in car stuff
+        else: self.load_ui_data()
+
+        # Regardless, update the cars
+        self['cars'] = cars
 
-            # Attempt to catch a new log file; clear out onlines
-            elif line.find('Assetto Corsa Dedicated Server') == 0:
-                self['online'] = dict()
-                if not init:
-                    self.send_state_messages()
-                    self.save_and_archive_state()
+    def _on_new_log(self, line, init):
+        """
+        Attempt to catch a new log file; clear out onlines
+        """
+        self['online'] = dict()
+        if not init:
+            self.send_state_messages()
+            self.save_and_archive_state()
 
     def vanilla_driver_connects(self, name, car, init):
         """
@@ -914,7 +1027,7 @@ class Monitor:
         log('\nnew_venue()')
 
         # Dump the existing state and copy to the archive before we update the timestamp
-        self.save_and_archive_state()
+        self.save_and_archive_state(force=True)
 
         # End any session message that is currently active.
         self.end_session()
@@ -944,20 +1057,35 @@ class Monitor:
         
         # Save and archive the state for good measure?
         log(self['laps'])
-        self.save_and_archive_state()
+        self.save_and_archive_state(force=True)
 
-    def save_and_archive_state(self, skip=False):
+    def save_and_archive_state(self, skip=False, force=False):
         """
         Writes the state to state.json and copies it to the archive.
+
+        Writes are debounced: the state is marked dirty and only actually
+        written if it has been a half second since the last write, unless
+        force=True. flush_state() picks up whatever is left over.
         """
         if skip: return
 
-        log('save_and_archive_state()', not skip)
+        # Most callers fire once per log event, which can be thousands of
+        # times in a burst; don't rewrite the whole state for each one.
+        self._state_dirty = True
+        if not force and time.monotonic() - self._last_state_flush < 0.5: return
+        self.flush_state()
+
+    def flush_state(self):
+        """
+        Writes the state to disk now, if anything marked it dirty.
+        """
+        if not self._state_dirty: return
+        self._state_dirty      = False
+        self._last_state_flush = time.monotonic()
+
+        log('save_and_archive_state()')
 
-        # Make sure we have the appropriate directories
-        if not os.path.exists('web'): os.mkdir('web')
-        path_archive = os.path.join('web', 'archive')
-        if not os.path.exists(path_archive): os.mkdir(path_archive)
+        path_archive = self._path_archive
 
         # Store the archive path for this particular state.json
         if self['track'] and self['timestamp']:
@@ -967,12 +1095,32 @@ class Monitor:
 
         log('  archive_path:', self['archive_path'])
 
-        # Dump the state
-        p = os.path.join('web', 'state.json')
-        with open(p, 'w', encoding="utf8") as f: json.dump(self.state, f, indent=2)
-
-        # Copy to the archive based on track name if it exists.
-        if self['archive_path']: shutil.copy(p, self['archive_path'])
+        # Serialize the state up front so we can tell whether anything
+        # actually changed.
+        if orjson: data = orjson.dumps(self.state, option=orjson.OPT_INDENT_2)
+        else:      data = json.dumps(self.state, indent=2).encode('utf8')
+
+        # Plenty of flushes produce identical bytes (e.g. a disconnect of
+        # someone who wasn't online); skip the disk entirely for those.
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if digest == self._last_state_digest: return
+        self._last_state_digest = digest
+
+        # Dump the state to a temp file and atomically swap it in, so the web
+        # frontend never reads a half-written state.json.
+        p   = self._path_state
+        tmp = p + '.tmp'
+        with open(tmp, 'wb') as f: f.write(data)
+        os.replace(tmp, p)
+
+        # Snapshot to the archive based on track name if it exists. A hardlink
+        # costs no data copy; fall back to a real copy on filesystems that
+        # can't link.
+        if self['archive_path']:
+            try:
+                if os.path.exists(self['archive_path']): os.remove(self['archive_path'])
+                os.link(p, self['archive_path'])
+            except OSError: shutil.copy(p, self['archive_path'])
 
         # Provide the website with a list of archives
         paths = glob.glob(os.path.join(path_archive, '*'))
@@ -1001,8 +1149,7 @@ class Monitor:
         """
         Given string s (e.g., '47:21:123'), return an integer number of ms.
         """
-        s = s.split(':')
-        return int(s[0])*60000 + int(s[1])*1000 + int(s[2])
+        return to_ms(s)
 
     def load_ui_data(self):
         """
@@ -1047,6 +1194,7 @@ class Monitor:
             # for the dictionary self['carsets']
             self['carsets'] = dict()
             self['stesrac'] = dict()
+            cars_set = set(self['cars'])
             for path in carset_paths:
                 log(' ', path)
 
@@ -1063,7 +1211,7 @@ class Monitor:
                     self['stesrac'][car].append(name)
 
                 # If this carset matches ours, remember this carset
-                if set(self['carsets'][name]) == set(self['cars']):
+                if set(self['carsets'][name]) == cars_set:
                     self['carset'] = name
 
         # Next load the nice names of all the cars for this venue
@@ -1081,6 +1229,9 @@ class Monitor:
                     self['carnames'][car] = car
                     log(' ', car, '(error)')
 
+        # The sorts bake in carset / car-name data, so invalidate them.
+        self._laps_version += 1
+
         # Dump modifications
         self.save_and_archive_state()
 
@@ -1099,6 +1250,11 @@ class Monitor:
         {carset:[(time_ms,(time,name,car,count)), (time_ms,(time,name,car,count))...]}
         """   
 
+        # This runs on every message update; reuse the last result if no
+        # laps have come in since. Callers only read the structure.
+        hit = self._sort_cache.get('by_carset')
+        if hit and hit[0] == self._laps_version: return hit[1]
+
         # Scan through the state and collect the driver best laps
         # laps will be {carset:[(time_ms,(time,name,car,count)), (time_ms,(time,name,car,count)), ...]}
         laps = dict() 
@@ -1150,15 +1306,17 @@ class Monitor:
                 break
         
         # Pop the venue to the top
+        cars_set = set(self['cars'])
         for n in range(len(carsets_sorted)):
             #print('\n\n', carsets_sorted[n], '\nSERVER', self['cars'], '\nCARSETS', self['carsets'][carsets_sorted[n]]) 
-            if set(self['cars']) == set(self['carsets'][carsets_sorted[n]]): 
+            if cars_set == set(self['carsets'][carsets_sorted[n]]): 
                 x = carsets_sorted.pop(n)
                 carsets_sorted.insert(0,x)
                 break
         
         laps_sorted = {i: laps[i] for i in carsets_sorted}
 
+        self._sort_cache['by_carset'] = (self._laps_version, laps_sorted)
         return laps_sorted
 
     def sort_best_laps_by_name_and_car(self):
@@ -1168,6 +1326,10 @@ class Monitor:
         {car:[(time_ms,(time,name,count)), (time_ms,(time,name,count))...]}
         """   
 
+        # Same caching deal as sort_best_laps_by_carset.
+        hit = self._sort_cache.get('by_name_and_car')
+        if hit and hit[0] == self._laps_version: return hit[1]
+
         # Scan through the state and collect the driver best laps
         # for each group
         laps_by_car   = dict() # car -indexed list of best laps
@@ -1221,6 +1383,7 @@ class Monitor:
             laps_by_car[car] = {k: v for k, v in sorted(laps_by_car[car].items(), key=lambda item: item[1]['time_ms'])}
             car_bests[car].sort()
 
+        self._sort_cache['by_name_and_car'] = (self._laps_version, (all_bests, car_bests, min_count))
         return all_bests, car_bests, min_count
 
     def get_stats_string(self, chars):
@@ -1273,10 +1436,12 @@ class Monitor:
         # Append to lines if there are more than one (to avoid double-information)
         for tm_ms in car_medians: lines.append(car_medians[tm_ms])
         
-        # Make sure we don't have too many characters
+        # Make sure we don't have too many characters; track the joined
+        # length as we pop rather than re-joining every iteration.
         popped = False
-        while len(lines) > 0 and len('\n'.join(lines)) > chars-4: # -4 for \n... 
-            lines.pop(-1)
+        total = sum(len(l)+1 for l in lines) - 1
+        while len(lines) > 0 and total > chars-4: # -4 for \n... 
+            total -= len(lines.pop(-1)) + 1
             popped = True
 
         # If we removed some lines, hint that there are more.
@@ -1310,10 +1475,12 @@ class Monitor:
                 n += 1
 
         #print('\n'.join(lines))
-        # Pop lines until the message is short enough to fit in N
+        # Pop lines until the message is short enough to fit in N, tracking
+        # the joined length as we go rather than re-joining every iteration.
         popped = False
-        while len(lines) > 0 and len('\n'.join(lines)) > chars-4: # -4 for \n... 
-            lines.pop(-1)
+        total = sum(len(l)+1 for l in lines) - 1
+        while len(lines) > 0 and total > chars-4: # -4 for \n... 
+            total -= len(lines.pop(-1)) + 1
             popped = True
 
         # If we have no lines, don't bother
@@ -1363,7 +1530,7 @@ class Monitor:
                 n += 1
         
         # Prune; we do this separately to not change the keys size in the above loop
-        # for namecar in old_namecars: self['seen_namecars'].pop(namecar)
+        for namecar in old_namecars: self['seen_namecars'].pop(namecar)
 
         # Return the string
         s = '**'+'\n'.join(onlines)+'**'
@@ -1445,6 +1612,8 @@ class Monitor:
                         log('pruning', name)
                         self['laps'].pop(name)
 
+                    self._laps_version += 1
+
 
 
 
@@ -1626,6 +1795,15 @@ class Monitor:
             
             
 
+    def _webhook_worker(self):
+        """
+        Daemon loop running queued webhook deletes in the background.
+        """
+        while True:
+            webhook, message_id = self._webhook_queue.get()
+            try: webhook.delete_message(message_id)
+            except Exception as e: log('delete_message failed:', e)
+
     def delete_message(self, webhook, message_id):
         """
         Deletes the supplied message.
@@ -1635,8 +1813,9 @@ class Monitor:
 
         log('delete_message()')
         if webhook and message_id:
-            try: webhook.delete_message(message_id)
-            except: pass
+            # Hand it to the worker thread; a Discord round trip takes
+            # hundreds of ms and the parse loop shouldn't wait on it.
+            self._webhook_queue.put((webhook, message_id))
 
     def send_message(self, webhook, message='', body1='', body2='', footer='', message_id=None, color=15548997):
         """